@@ -0,0 +1,73 @@
+"""Latency percentiles and payload size per HTTP endpoint, measured in-process.
+
+Run from the repository root:
+
+    python benchmarks/endpoints.py [--requests 200]
+
+Requests go through Flask's test client, so the numbers cover routing,
+the handlers and response encoding but not the network or the WSGI server.
+Each endpoint is requested once untimed to warm its caches.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+ENDPOINTS = [
+    "/calendar-data",
+    "/calendar-data?year=2030",
+    "/calendar-data?from=2025-03&to=2025-03",
+    "/calendar-data?stream=json&year=2030",
+    "/search?q=иван",
+    "/search?q=пост&from=1900-01&to=2099-12",
+    "/name-days/Иван?from=1900-01&to=2099-12",
+    "/calendar.ics?year=2025",
+    "/business-days/count?start=1900-01-01&end=2099-12-31",
+    "/business-days/add?date=2025-01-02&days=250",
+]
+
+# Year counts for the streamed payload sweep; the API supports up to MAX_YEAR - MIN_YEAR + 1.
+STREAM_RANGES = (1, 10, 100, 200)
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, round(fraction * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+def measure(client, url, requests):
+    """Returns (p50 seconds, p99 seconds, payload bytes) for url."""
+    size = len(client.get(url).get_data())
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        client.get(url).get_data()
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return percentile(timings, 0.5), percentile(timings, 0.99), size
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    client = main.app.test_client()
+    print(f"{'endpoint':<58} {'p50 ms':>8} {'p99 ms':>8} {'bytes':>10}")
+    for url in ENDPOINTS:
+        p50, p99, size = measure(client, url, args.requests)
+        print(f"{url:<58} {p50 * 1000:>8.3f} {p99 * 1000:>8.3f} {size:>10}")
+
+    print()
+    print("streamed /calendar-data by range (first request, caches cold)")
+    for years in STREAM_RANGES:
+        main._year_json_cache.clear()
+        url = f"/calendar-data?stream=ndjson&from={main.MIN_YEAR}-01&to={main.MIN_YEAR + years - 1}-12"
+        started = time.perf_counter()
+        size = len(client.get(url).get_data())
+        print(f"  {years:>4} years {(time.perf_counter() - started) * 1000:>9.1f} ms {size:>12} bytes")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
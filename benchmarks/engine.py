@@ -0,0 +1,92 @@
+"""Calendar engine cost: time per generated year, JSON encoding and peak memory by range.
+
+Run from the repository root:
+
+    python benchmarks/engine.py [--years 200] [--repeat 3] [--ranges 1,10,100,500]
+
+The calendar store is ignored so that years are really computed.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+START_YEAR = 1900
+
+def best_of(repeat, run, setup=None):
+    """Best wall time of run() over repeat attempts, calling setup() untimed before each."""
+    best = float("inf")
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def clear_caches():
+    main.get_year_table.cache_clear()
+    main.get_orthodox_easter.cache_clear()
+    main._year_json_cache.clear()
+
+def peak_memory(run):
+    """Peak traced allocation in bytes while run() executes."""
+    clear_caches()
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def buffered_json(years):
+    """The original response path: every month as dicts, then one jsonify-style encode."""
+    data = main.generate_calendar_data(START_YEAR, START_YEAR + years - 1)
+    return json.dumps(data, ensure_ascii=True, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+def streamed_json(years):
+    """The streaming response path, consumed chunk by chunk."""
+    size = 0
+    months = main.iter_encoded_months((START_YEAR, 1), (START_YEAR + years - 1, 12))
+    for chunk in main.iter_json_array(months):
+        size += len(chunk)
+    return size
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=int, default=200, help="years timed per measurement")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--ranges", default="1,10,100,500", help="year counts for the memory sweep")
+    args = parser.parse_args()
+    main.calendar_store = None
+
+    years = range(START_YEAR, START_YEAR + args.years)
+    per_year = lambda seconds: f"{seconds / len(years) * 1000:8.3f} ms/year"
+
+    print("generation")
+    print(f"  build_year_table     {per_year(best_of(args.repeat, lambda: [main.build_year_table(y) for y in years], clear_caches))}")
+    print(f"  generate_year_data   {per_year(best_of(args.repeat, lambda: [main.generate_year_data(y) for y in years], clear_caches))}")
+
+    # Encoding alone, with the year tables already built.
+    months_by_year = [main.generate_year_data(year) for year in years]
+    print("json encoding")
+    print(f"  json.dumps of dicts  {per_year(best_of(args.repeat, lambda: [json.dumps(m, ensure_ascii=True, sort_keys=True, separators=(',', ':')) for m in months_by_year]))}")
+    print(f"  encode_year_months   {per_year(best_of(args.repeat, lambda: [main.encode_year_months(y) for y in years]))}")
+
+    print("peak memory by range")
+    print(f"  {'years':>6} {'buffered':>12} {'streamed':>12} {'payload':>12}")
+    for count in (int(value) for value in args.ranges.split(",")):
+        payload = []
+        buffered = peak_memory(lambda: buffered_json(count))
+        streamed = peak_memory(lambda: payload.append(streamed_json(count)))
+        print(f"  {count:>6} {buffered / 2**20:>9.1f} MB {streamed / 2**20:>9.1f} MB {payload[0] / 2**20:>9.1f} MB")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,64 @@
+"""Per-year cost of assembling calendar years, with a golden-output check.
+
+Run from the repository root:
+
+    python benchmarks/year_assembly.py [--start 1900] [--end 2099] [--repeat 5]
+
+The JSON served for 1900-01..2099-12 must match GOLDEN_SHA256, the digest of
+the original jsonify(generate_calendar_data(1900, 2099)) response body; the
+script exits with status 1 if it does not. The calendar store is ignored.
+"""
+import argparse
+import hashlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+GOLDEN_SHA256 = "8e72978074313f1be5fc715cb42364fbec8a16f7cc22063c6d2a5161ea3ae5a7"
+
+def golden_digest():
+    """Digest of the /calendar-data body for 1900-2099, built from scratch."""
+    parts = [b",".join(main.encode_year_months(year)) for year in range(1900, 2100)]
+    return hashlib.sha256(b"[" + b",".join(parts) + b"]\n").hexdigest()
+
+def per_year_ms(build, years, repeat):
+    """Best-of-repeat milliseconds per year for build over years, with cold caches."""
+    best = float("inf")
+    for _ in range(repeat):
+        main.get_year_table.cache_clear()
+        started = time.perf_counter()
+        for year in years:
+            build(year)
+        best = min(best, time.perf_counter() - started)
+    return best / len(years) * 1000
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--start", type=int, default=1900)
+    parser.add_argument("--end", type=int, default=2099)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    # Time the assembly itself rather than reads from the calendar store.
+    main.calendar_store = None
+
+    digest = golden_digest()
+    if digest != GOLDEN_SHA256:
+        print(f"golden output mismatch: {digest} != {GOLDEN_SHA256}")
+        return 1
+    print("golden output: ok")
+
+    years = range(args.start, args.end + 1)
+    for label, build in (
+        ("build_year_table", main.build_year_table),
+        ("generate_year_data", main.generate_year_data),
+        ("encode_year_months", main.encode_year_months),
+    ):
+        print(f"{label:<20} {per_year_ms(build, years, args.repeat):8.3f} ms/year")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
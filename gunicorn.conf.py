@@ -0,0 +1,19 @@
+# Production server settings, used by ./prodserver.sh:
+#   gunicorn --config gunicorn.conf.py
+import gc
+import multiprocessing
+import os
+
+wsgi_app = "main:create_app()"
+bind = f"0.0.0.0:{os.environ.get('PORT', 8080)}"
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get("GUNICORN_THREADS", 1))
+
+# Build the calendar caches once in the master so forked workers share them
+# copy-on-write instead of each paying the warm-up on its first request.
+preload_app = True
+
+def pre_fork(server, worker):
+    # Move the preloaded objects out of the garbage collector's reach so
+    # collections in the workers do not touch, and thereby copy, their pages.
+    gc.freeze()
@@ -1,9 +1,358 @@
 import os
-from flask import Flask, render_template, jsonify
-from datetime import date, timedelta
+import sys
+import json
+import mmap
+import struct
+import re
+import bisect
+import hashlib
+import heapq
+import itertools
+import threading
+import time
+import types
+from collections import Counter
+from array import array
+from functools import lru_cache
+from flask import Flask, render_template, request, abort, jsonify, g
+from datetime import date, datetime, timedelta, timezone
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for the bulk movable-feast API
+    np = None
 
 app = Flask(__name__, template_folder='src')
 
+DEFAULT_START_YEAR = 2024
+DEFAULT_END_YEAR = 2027
+CALENDAR_DATA_MAX_AGE = 3600
+# Years for which the Julian-to-Gregorian offset used by get_orthodox_easter holds.
+MIN_YEAR = 1900
+MAX_YEAR = 2099
+MAX_RANGE_MONTHS = 120
+SEARCH_PER_PAGE = 50
+SEARCH_MAX_PER_PAGE = 500
+# Far beyond the last page of any query, and keeps page * per_page a small integer.
+SEARCH_MAX_PAGE = 1_000_000
+ICS_MAX_AGE = 3600
+BUSINESS_DAYS_MAX_BATCH = 1000
+# Generated data only changes when the rules in this file do.
+RULES_LAST_MODIFIED = datetime.fromtimestamp(int(os.path.getmtime(__file__)), timezone.utc)
+
+# Hit/miss counts for the caches that are not plain lru_caches, reported by /metrics.
+cache_counters = Counter()
+
+# Pre-encoded JSON per year: each month of a year serialized exactly as jsonify
+# would, so any window of months can be joined into a response cheaply.
+_year_json_cache = {}
+
+month_names_bg = ["Януари", "Февруари", "Март", "Април", "Май", "Юни", "Юли", "Август", "Септември", "Октомври", "Ноември", "Декември"]
+
+descriptions = {
+    # Orthodox Movable
+    "easter": "Най-големият празник в православния календар. Чества се възкресението на Исус Христос.",
+    "palm_sunday": "Подвижен празник, който се празнува в неделята преди Великден. Отбелязва тържественото влизане на Исус Христос в Йерусалим.",
+    "ascension": "Подвижен празник, който се празнува 40 дни след Великден. Отбелязва възнесението на Исус Христос на небето.",
+    "pentecost": "Празнува се на 50-ия ден след Великден. На този ден Светият Дух слиза над апостолите.",
+    "good_friday": "Денят, в който е разпнат Исус Христос. Строг пост.",
+    "holy_saturday": "Последният ден от Страстната седмица. Ден на очакване на Възкресението.",
+    "sirni_zagovezni": "Последният ден преди началото на Великия пост. Искаме и даваме прошка.",
+    "todorovden": "Празник, посветен на Св. Тодор. Известен с конни надбягвания.",
+    "lazarovden": "Подвижен празник, който се отбелязва в съботата преди Цветница. Свързан е с лазаруване.",
+    "zadushnica_before_pentecost": "Черешова задушница. Една от големите задушници, в която се почитат починалите.",
+    "zadushnica_before_great_lent": "Месопустна задушница. Задушница преди началото на Великия пост.",
+    "zadushnica_before_st_michael": "Архангелова задушница. Последната голяма задушница за годината.",
+
+    # Orthodox Fixed
+    "theophany": "Празник, на който се чества кръщението на Исус Христос в река Йордан. Извършва се ритуал по хвърляне на кръста във вода.",
+    "three_holy_hierarchs": "Събор на Св. три светители - Василий Велики, Григорий Богослов и Йоан Златоуст.",
+    "annunciation": "Един от 12-те големи християнски празници, на който Архангел Гавриил съобщава на Дева Мария благата вест, че тя ще роди Спасителя.",
+    "st_george_orthodox": "Ден на Св. вмчк. Георги Победоносец, един от най-почитаните светци в православието.",
+    "sts_cyril_methodius_orthodox": "Ден на светите братя Кирил и Методий, създатели на славянската азбука.",
+    "transfiguration": "Един от 12-те големи християнски празници, на който се чества явяването на Исус Христос в божествена светлина пред трима от учениците си.",
+    "dormition": "Един от 12-те големи християнски празници, посветен на смъртта (успението) на Божията майка.",
+    "nativity_theotokos": "Рождество на Пресвета Богородица. Един от 12-те големи празници.",
+    "cross_elevation": "Един от 12-те велики празници. Свързан е с намирането на кръста, на който е бил разпнат Исус Христос.",
+    "protection_theotokos": "Покров на Пресвета Богородица, празник на закрилата, която Божията майка дава на вярващите.",
+    "st_john_of_rila": "Ден на Св. Йоан Рилски Чудотворец, покровител на българския народ.",
+    "presentation_theotokos": "Въведение Богородично. Ден на християнското семейство и младеж.",
+    "st_nicholas": "Един от най-почитаните светци в източното православие, покровител на моряците, рибарите и банкерите.",
+    "christmas_eve": "На този ден православната църква отбелязва навечерието на Рождество Христово. Традиционно се приготвя постна вечеря с нечетен брой ястия.",
+
+    # Fasting
+    "great_lent": "Най-важният и най-продължителният постен период в църковната година. Подготовка за Великден.",
+    "apostles_fast": "Петров пост. Пост, установен в памет на светите апостоли Петър и Павел и тяхното дело.",
+    "dormition_fast": "Богородичен пост. Двуседмичен пост преди празника Успение Богородично.",
+    "nativity_fast": "Рождественски пост. Четиридесетдневен пост преди Рождество Христово.",
+    "strict_fast": "Ден на строг пост. Пълно въздържание от храна.",
+
+    # Secular
+    "new_year": "Официален почивен ден.",
+    "liberation_day": "Национален празник на България.",
+    "labor_day": "Международен ден на труда.",
+    "st_georges_day_secular": "Ден на храбростта и Българската армия.",
+    "cyril_methodius_day_secular": "Ден на българската просвета, култура и на славянската писменост.",
+    "unification_day": "Ден на Съединението.",
+    "independence_day": "Ден на Независимостта.",
+    "non_working": "Официален почивен ден.",
+
+    # Name Days
+    "nameday_description": "На този ден празнуват хората, носещи имена, свързани със светеца, който се чества."
+}
+
+name_days = {
+    (1, 1): ["Васил", "Василка", "Веселин", "Веселина", "Весела"],
+    (1, 2): ["Силвестър", "Силвия"],
+    (1, 6): ["Йордан", "Йорданка", "Данчо", "Богдан", "Богдана", "Богомил", "Найден"],
+    (1, 7): ["Иван", "Ивана", "Иванка", "Йоан", "Йоана", "Калоян", "Иво", "Йовко", "Йото", "Ванина", "Жана"],
+    (1, 9): ["Юлиян", "Юлияна"],
+    (1, 11): ["Богдан", "Теодосий"],
+    (1, 12): ["Татяна", "Таня"],
+    (1, 14): ["Нина"],
+    (1, 17): ["Антон", "Антония", "Андон", "Дончо", "Донка"],
+    (1, 18): ["Атанас", "Атанаска", "Наско"],
+    (1, 20): ["Евтим", "Евтимия"],
+    (1, 21): ["Максим", "Максима"],
+    (1, 25): ["Григор", "Григорена"],
+    (1, 30): ["Василий", "Григорий", "Йоан"],
+    (2, 1): ["Трифон", "Лозан", "Лоза"],
+    (2, 3): ["Симеон", "Симона", "Моника"],
+    (2, 4): ["Желязко", "Добрин"],
+    (2, 6): ["Доротея", "Огнян", "Пламен", "Пламена"],
+    (2, 10): ["Харалампи", "Валентин", "Валентина", "Ламби"],
+    (2, 13): ["Евлоги"],
+    (2, 14): ["Трифон Зарезан"],
+    (3, 1): ["Марта", "Мартин", "Мартина"],
+    (3, 6): ["Красимир", "Красимира"],
+    (3, 9): ["Младен", "Младена"],
+    (3, 17): ["Алексей", "Алекси"],
+    (3, 22): ["Емил", "Емилия", "Емануил"],
+    (3, 24): ["Захари", "Захарина"],
+    (3, 25): ["Благовест", "Благовеста", "Благой", "Евангелина"],
+    (4, 1): ["Лидия"],
+    (4, 6): ["Страхил"],
+    (4, 14): ["Мартин"],
+    (4, 18): ["Виктор", "Виктория"],
+    (4, 25): ["Марк", "Марко"],
+    (4, 26): ["Габриела"],
+    (5, 2): ["Борис", "Боряна", "Борислава"],
+    (5, 5): ["Ирина", "Мирослав", "Мира"],
+    (5, 6): ["Георги", "Георгина", "Гергана", "Гинка", "Гоце"],
+    (5, 11): ["Кирил", "Кирилка", "Методий", "Методия"],
+    (5, 21): ["Константин", "Елена", "Костадин", "Костадинка", "Динко", "Ели"],
+    (6, 24): ["Еньо", "Енчо", "Яни", "Яна", "Янко", "Янка", "Дияна", "Диан", "Диана"],
+    (6, 29): ["Петър", "Павел", "Петя", "Полина", "Павлина", "Камен"],
+    (6, 30): ["Апостол"],
+    (7, 1): ["Дамян", "Дамяна"],
+    (7, 7): ["Неделя", "Недялко", "Недялка"],
+    (7, 15): ["Владимир", "Владислава", "Господин"],
+    (7, 16): ["Юлия", "Юлиан"],
+    (7, 17): ["Марин", "Марина"],
+    (7, 20): ["Илия", "Илияна", "Илко", "Илка"],
+    (7, 22): ["Магдалена", "Миглена"],
+    (7, 25): ["Анна"],
+    (7, 27): ["Пантелей", "Панчо"],
+    (8, 8): ["Емилиян"],
+    (8, 15): ["Мария", "Мариана", "Марио", "Марияна", "Мара"],
+    (8, 20): ["Самуил"],
+    (8, 26): ["Адриан", "Адриана", "Наталия"],
+    (8, 29): ["Анастас", "Анастасия"],
+    (8, 30): ["Александър", "Александра", "Алекс", "Цанко"],
+    (9, 1): ["Симеон", "Симона"],
+    (9, 5): ["Захари", "Елисавета"],
+    (9, 16): ["Людмил", "Людмила"],
+    (9, 17): ["София", "Вяра", "Надежда", "Любов", "Любомир", "Любомира"],
+    (9, 23): ["Поликсена"],
+    (10, 1): ["Покров"],
+    (10, 5): ["Игор"],
+    (10, 14): ["Петко", "Петка", "Пенчо", "Пенка"],
+    (10, 18): ["Злата", "Златина"],
+    (10, 19): ["Йоан", "Иван"],
+    (10, 26): ["Димитър", "Димитрина", "Димо", "Димка", "Митра"],
+    (10, 27): ["Нестор"],
+    (11, 4): ["Павел"],
+    (11, 8): ["Ангел", "Ангелина", "Михаил", "Михаела", "Рангел", "Райна", "Радко"],
+    (11, 11): ["Виктор", "Виктория", "Мина"],
+    (11, 14): ["Филип", "Филипа"],
+    (11,16): ["Матей"],
+    (11, 21): ["Въведение"],
+    (11, 24): ["Екатерина", "Катя"],
+    (11, 25): ["Климент"],
+    (11, 26): ["Стилиян", "Стилияна"],
+    (11, 30): ["Андрей", "Андрея"],
+    (12, 5): ["Сава", "Савка"],
+    (12, 6): ["Никола", "Николай", "Николина", "Нина", "Ненка", "Кольо"],
+    (12, 9): ["Анна", "Анка"],
+    (12, 17): ["Данаил", "Даниел", "Даниела"],
+    (12, 20): ["Игнат", "Огнян", "Пламен"],
+    (12, 22): ["Анастасия"],
+    (12, 24): ["Евгени", "Евгения", "Жени"],
+    (12, 25): ["Христо", "Христина", "Радослав", "Радостина", "Божидар"],
+    (12, 26): ["Йосиф", "Давид"],
+    (12, 27): ["Стефан", "Стефка", "Стоян", "Стоянка", "Стамен", "Цоньо", "Цонка"]
+}
+
+# Name days that follow a movable feast, keyed as in get_movable_feast_dates.
+movable_name_days = {
+    "todorovden": ["Тодор", "Тодорка", "Теодор"],
+    "lazarovden": ["Лазар", "Лазарка"],
+    "palm_sunday": ["Цветан", "Цветанка", "Цветомир", "Цветомира"],
+    "ascension": ["Спас", "Спаска"],
+}
+
+fixed_holidays = {
+    (1, 1): [{"name": "Нова година", "type": "secular", "description": descriptions["new_year"]}],
+    (1, 6): [{"name": "Богоявление (Йордановден)", "type": "orthodox", "description": descriptions["theophany"]}],
+    (1, 30): [{"name": "Св. Три Светители", "type": "orthodox", "description": descriptions["three_holy_hierarchs"]}],
+    (3, 3): [{"name": "Освобождение на България", "type": "secular", "description": descriptions["liberation_day"]}],
+    (3, 25): [{"name": "Благовещение", "type": "orthodox", "description": descriptions["annunciation"]}],
+    (5, 1): [{"name": "Ден на труда", "type": "secular", "description": descriptions["labor_day"]}],
+    (5, 6): [
+        {"name": "Гергьовден, Ден на храбростта", "type": "secular", "description": descriptions["st_georges_day_secular"]},
+        {"name": "Св. вмчк. Георги Победоносец", "type": "orthodox", "description": descriptions["st_george_orthodox"]}
+    ],
+    (5, 24): [
+        {"name": "Ден на славянската писменост", "type": "secular", "description": descriptions["cyril_methodius_day_secular"]},
+        {"name": "Св. св. Кирил и Методий", "type": "orthodox", "description": descriptions["sts_cyril_methodius_orthodox"]}
+    ],
+    (8, 6): [{"name": "Преображение Господне", "type": "orthodox", "description": descriptions["transfiguration"]}],
+    (8, 15): [{"name": "Успение Богородично", "type": "orthodox", "description": descriptions["dormition"]}],
+    (9, 6): [{"name": "Ден на Съединението", "type": "secular", "description": descriptions["unification_day"]}],
+    (9, 8): [{"name": "Рождество Богородично", "type": "orthodox", "description": descriptions["nativity_theotokos"]}],
+    (9, 14): [{"name": "Въздвижение на Светия Кръст (Кръстовден)", "type": "orthodox", "description": descriptions["cross_elevation"]}],
+    (9, 22): [{"name": "Ден на Независимостта", "type": "secular", "description": descriptions["independence_day"]}],
+    (10, 1): [{"name": "Покров Богородичен", "type": "orthodox", "description": descriptions["protection_theotokos"]}],
+    (10, 19): [{"name": "Св. Йоан Рилски", "type": "orthodox", "description": descriptions["st_john_of_rila"]}],
+    (11, 21): [{"name": "Въведение Богородично", "type": "orthodox", "description": descriptions["presentation_theotokos"]}],
+    (12, 6): [{"name": "Св. Николай Чудотворец (Никулден)", "type": "orthodox", "description": descriptions["st_nicholas"]}],
+    (12, 24): [{"name": "Бъдни вечер", "type": "orthodox", "description": descriptions["christmas_eve"]}],
+    (12, 25): [{"name": "Рождество Христово", "type": "orthodox"}],
+    (12, 26): [{"name": "Събор на Пресвета Богородица", "type": "orthodox"}]
+}
+
+non_working_days_fixed = [(1,1), (3,3), (5,1), (5,6), (5,24), (9,6), (9,22), (12,24), (12,25), (12,26)]
+
+# Order in which the events of a day are listed; unknown types go last.
+type_priority = ['non-working', 'orthodox', 'secular', 'name-day', 'fasting']
+
+class EventCatalog:
+    """Stores each distinct calendar event once, along with its encoded JSON, under a small integer id."""
+
+    def __init__(self):
+        self.events = []
+        self.encoded = []
+        self.names = []
+        self.priorities = []
+        self._ids = {}
+
+    def add(self, name, event_type, description=None):
+        """Returns the id of the event, adding it to the catalog if it is new."""
+        key = (name, event_type, description)
+        event_id = self._ids.get(key)
+        if event_id is None:
+            event = {"name": name, "type": event_type}
+            if description is not None:
+                event["description"] = description
+            event_id = self._ids[key] = len(self.events)
+            self.events.append(event)
+            self.names.append(name)
+            self.priorities.append(type_priority.index(event_type) if event_type in type_priority else 99)
+            # Same settings as Flask's compact jsonify output.
+            self.encoded.append(json.dumps(event, ensure_ascii=True, sort_keys=True, separators=(",", ":")).encode("utf-8"))
+        return event_id
+
+event_catalog = EventCatalog()
+
+name_day_event_ids = {
+    month_day: event_catalog.add(f"Имен ден: {', '.join(names)}", "name-day", descriptions["nameday_description"])
+    for month_day, names in name_days.items()
+}
+
+fixed_holiday_event_ids = {
+    month_day: [event_catalog.add(event["name"], event["type"], event.get("description")) for event in events]
+    for month_day, events in fixed_holidays.items()
+}
+
+class YearTable:
+    """A year of calendar events as parallel typed arrays, in the order they are listed.
+
+    days holds the zero-based day of the year and event_ids the matching
+    event_catalog id, two bytes each per event. Tables loaded from the
+    calendar store hold memoryviews into the mapped file instead of arrays.
+    """
+    __slots__ = ("year", "days", "event_ids")
+
+    def __init__(self, year, days=None, event_ids=None):
+        self.year = year
+        self.days = array("H") if days is None else days
+        self.event_ids = array("H") if event_ids is None else event_ids
+
+    def rows(self):
+        return self.days, self.event_ids
+
+class YearBuilder:
+    """Collects the events of a year into day slots kept in display order as they are added.
+
+    Each slot is ordered by type_priority, keeping insertion order within a
+    type, and holds at most one event per name: the one that sorts first.
+    """
+    __slots__ = ("year", "jan_1", "slots")
+
+    def __init__(self, year):
+        self.year = year
+        self.jan_1 = date(year, 1, 1).toordinal()
+        self.slots = [None] * (366 if is_leap_year(year) else 365)
+
+    def add(self, day, *event_ids):
+        """Adds events on a date; dates outside the year are ignored."""
+        day_of_year = day.toordinal() - self.jan_1
+        if 0 <= day_of_year < len(self.slots):
+            for event_id in event_ids:
+                self._insert(day_of_year, event_id)
+
+    def add_range(self, first_day, days, event_id):
+        """Adds an event on each of the given number of days starting at first_day."""
+        first = first_day.toordinal() - self.jan_1
+        for day_of_year in range(max(first, 0), min(first + days, len(self.slots))):
+            self._insert(day_of_year, event_id)
+
+    def _insert(self, day_of_year, event_id):
+        slot = self.slots[day_of_year]
+        if slot is None:
+            self.slots[day_of_year] = [event_id]
+            return
+        names, priorities = event_catalog.names, event_catalog.priorities
+        name, priority = names[event_id], priorities[event_id]
+        for position, other in enumerate(slot):
+            if names[other] == name:
+                if priorities[other] <= priority:
+                    return
+                del slot[position]
+                break
+        position = len(slot)
+        while position and priorities[slot[position - 1]] > priority:
+            position -= 1
+        slot.insert(position, event_id)
+
+    def table(self):
+        table = YearTable(self.year)
+        slots = self.slots
+        table.days = array("H", [day_of_year for day_of_year, slot in enumerate(slots) if slot for _ in slot])
+        table.event_ids = array("H", [event_id for slot in slots if slot for event_id in slot])
+        return table
+
+def is_leap_year(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+def _build_day_labels(leap):
+    """Returns (month index, day key) for every zero-based day of a year."""
+    first = date(2024 if leap else 2023, 1, 1)
+    return [(day.month - 1, str(day.day)) for day in (first + timedelta(days=i) for i in range(366 if leap else 365))]
+
+_DAY_LABELS = (_build_day_labels(False), _build_day_labels(True))
+
+@lru_cache(maxsize=None)
 def get_orthodox_easter(year):
     """Calculates the date of Orthodox Easter for a given year using the Meeus/Butcher algorithm."""
     a = year % 4
@@ -15,297 +364,340 @@ def get_orthodox_easter(year):
     day = ((d + e + 114) % 31) + 1
     return date(year, month, day) + timedelta(days=13)
 
-def generate_calendar_data(start_year, end_year):
-    """Generates the full calendar data including fixed, movable, and fasting dates."""
-    calendar_data = []
-    month_names_bg = ["Януари", "Февруари", "Март", "Април", "Май", "Юни", "Юли", "Август", "Септември", "Октомври", "Ноември", "Декември"]
-
-    descriptions = {
-        # Orthodox Movable
-        "easter": "Най-големият празник в православния календар. Чества се възкресението на Исус Христос.",
-        "palm_sunday": "Подвижен празник, който се празнува в неделята преди Великден. Отбелязва тържественото влизане на Исус Христос в Йерусалим.",
-        "ascension": "Подвижен празник, който се празнува 40 дни след Великден. Отбелязва възнесението на Исус Христос на небето.",
-        "pentecost": "Празнува се на 50-ия ден след Великден. На този ден Светият Дух слиза над апостолите.",
-        "good_friday": "Денят, в който е разпнат Исус Христос. Строг пост.",
-        "holy_saturday": "Последният ден от Страстната седмица. Ден на очакване на Възкресението.",
-        "sirni_zagovezni": "Последният ден преди началото на Великия пост. Искаме и даваме прошка.",
-        "todorovden": "Празник, посветен на Св. Тодор. Известен с конни надбягвания.",
-        "lazarovden": "Подвижен празник, който се отбелязва в съботата преди Цветница. Свързан е с лазаруване.",
-        "zadushnica_before_pentecost": "Черешова задушница. Една от големите задушници, в която се почитат починалите.",
-        "zadushnica_before_great_lent": "Месопустна задушница. Задушница преди началото на Великия пост.",
-        "zadushnica_before_st_michael": "Архангелова задушница. Последната голяма задушница за годината.",
-        
-        # Orthodox Fixed
-        "theophany": "Празник, на който се чества кръщението на Исус Христос в река Йордан. Извършва се ритуал по хвърляне на кръста във вода.",
-        "three_holy_hierarchs": "Събор на Св. три светители - Василий Велики, Григорий Богослов и Йоан Златоуст.",
-        "annunciation": "Един от 12-те големи християнски празници, на който Архангел Гавриил съобщава на Дева Мария благата вест, че тя ще роди Спасителя.",
-        "st_george_orthodox": "Ден на Св. вмчк. Георги Победоносец, един от най-почитаните светци в православието.",
-        "sts_cyril_methodius_orthodox": "Ден на светите братя Кирил и Методий, създатели на славянската азбука.",
-        "transfiguration": "Един от 12-те големи християнски празници, на който се чества явяването на Исус Христос в божествена светлина пред трима от учениците си.",
-        "dormition": "Един от 12-те големи християнски празници, посветен на смъртта (успението) на Божията майка.",
-        "nativity_theotokos": "Рождество на Пресвета Богородица. Един от 12-те големи празници.",
-        "cross_elevation": "Един от 12-те велики празници. Свързан е с намирането на кръста, на който е бил разпнат Исус Христос.",
-        "protection_theotokos": "Покров на Пресвета Богородица, празник на закрилата, която Божията майка дава на вярващите.",
-        "st_john_of_rila": "Ден на Св. Йоан Рилски Чудотворец, покровител на българския народ.",
-        "presentation_theotokos": "Въведение Богородично. Ден на християнското семейство и младеж.",
-        "st_nicholas": "Един от най-почитаните светци в източното православие, покровител на моряците, рибарите и банкерите.",
-        "christmas_eve": "На този ден православната църква отбелязва навечерието на Рождество Христово. Традиционно се приготвя постна вечеря с нечетен брой ястия.",
-
-        # Fasting
-        "great_lent": "Най-важният и най-продължителният постен период в църковната година. Подготовка за Великден.",
-        "apostles_fast": "Петров пост. Пост, установен в памет на светите апостоли Петър и Павел и тяхното дело.",
-        "dormition_fast": "Богородичен пост. Двуседмичен пост преди празника Успение Богородично.",
-        "nativity_fast": "Рождественски пост. Четиридесетдневен пост преди Рождество Христово.",
-        "strict_fast": "Ден на строг пост. Пълно въздържание от храна.",
-
-        # Secular
-        "new_year": "Официален почивен ден.",
-        "liberation_day": "Национален празник на България.",
-        "labor_day": "Международен ден на труда.",
-        "st_georges_day_secular": "Ден на храбростта и Българската армия.",
-        "cyril_methodius_day_secular": "Ден на българската просвета, култура и на славянската писменост.",
-        "unification_day": "Ден на Съединението.",
-        "independence_day": "Ден на Независимостта.",
-        "non_working": "Официален почивен ден.",
-
-        # Name Days
-        "nameday_description": "На този ден празнуват хората, носещи имена, свързани със светеца, който се чества."
+def get_movable_feast_dates(year):
+    """Returns the Easter-relative feasts of a year that other movable dates are derived from."""
+    easter_date = get_orthodox_easter(year)
+    todorovden_offset = (easter_date.weekday() - 5) % 7
+    # Palm Sunday is the Sunday before Easter
+    palm_sunday = easter_date - timedelta(days=7)
+    return {
+        "easter": easter_date,
+        "todorovden": easter_date - timedelta(days=48 + todorovden_offset),
+        # Lazarovden is the Saturday before Palm Sunday
+        "lazarovden": palm_sunday - timedelta(days=1),
+        "palm_sunday": palm_sunday,
+        "ascension": easter_date + timedelta(days=39),
+        "pentecost": easter_date + timedelta(days=49),
     }
 
-    name_days = {
-        (1, 1): ["Васил", "Василка", "Веселин", "Веселина", "Весела"],
-        (1, 2): ["Силвестър", "Силвия"],
-        (1, 6): ["Йордан", "Йорданка", "Данчо", "Богдан", "Богдана", "Богомил", "Найден"],
-        (1, 7): ["Иван", "Ивана", "Иванка", "Йоан", "Йоана", "Калоян", "Иво", "Йовко", "Йото", "Ванина", "Жана"],
-        (1, 9): ["Юлиян", "Юлияна"],
-        (1, 11): ["Богдан", "Теодосий"],
-        (1, 12): ["Татяна", "Таня"],
-        (1, 14): ["Нина"],
-        (1, 17): ["Антон", "Антония", "Андон", "Дончо", "Донка"],
-        (1, 18): ["Атанас", "Атанаска", "Наско"],
-        (1, 20): ["Евтим", "Евтимия"],
-        (1, 21): ["Максим", "Максима"],
-        (1, 25): ["Григор", "Григорена"],
-        (1, 30): ["Василий", "Григорий", "Йоан"],
-        (2, 1): ["Трифон", "Лозан", "Лоза"],
-        (2, 3): ["Симеон", "Симона", "Моника"],
-        (2, 4): ["Желязко", "Добрин"],
-        (2, 6): ["Доротея", "Огнян", "Пламен", "Пламена"],
-        (2, 10): ["Харалампи", "Валентин", "Валентина", "Ламби"],
-        (2, 13): ["Евлоги"],
-        (2, 14): ["Трифон Зарезан"],
-        (3, 1): ["Марта", "Мартин", "Мартина"],
-        (3, 6): ["Красимир", "Красимира"],
-        (3, 9): ["Младен", "Младена"],
-        (3, 17): ["Алексей", "Алекси"],
-        (3, 22): ["Емил", "Емилия", "Емануил"],
-        (3, 24): ["Захари", "Захарина"],
-        (3, 25): ["Благовест", "Благовеста", "Благой", "Евангелина"],
-        (4, 1): ["Лидия"],
-        (4, 6): ["Страхил"],
-        (4, 14): ["Мартин"],
-        (4, 18): ["Виктор", "Виктория"],
-        (4, 25): ["Марк", "Марко"],
-        (4, 26): ["Габриела"],
-        (5, 2): ["Борис", "Боряна", "Борислава"],
-        (5, 5): ["Ирина", "Мирослав", "Мира"],
-        (5, 6): ["Георги", "Георгина", "Гергана", "Гинка", "Гоце"],
-        (5, 11): ["Кирил", "Кирилка", "Методий", "Методия"],
-        (5, 21): ["Константин", "Елена", "Костадин", "Костадинка", "Динко", "Ели"],
-        (6, 24): ["Еньо", "Енчо", "Яни", "Яна", "Янко", "Янка", "Дияна", "Диан", "Диана"],
-        (6, 29): ["Петър", "Павел", "Петя", "Полина", "Павлина", "Камен"],
-        (6, 30): ["Апостол"],
-        (7, 1): ["Дамян", "Дамяна"],
-        (7, 7): ["Неделя", "Недялко", "Недялка"],
-        (7, 15): ["Владимир", "Владислава", "Господин"],
-        (7, 16): ["Юлия", "Юлиан"],
-        (7, 17): ["Марин", "Марина"],
-        (7, 20): ["Илия", "Илияна", "Илко", "Илка"],
-        (7, 22): ["Магдалена", "Миглена"],
-        (7, 25): ["Анна"],
-        (7, 27): ["Пантелей", "Панчо"],
-        (8, 8): ["Емилиян"],
-        (8, 15): ["Мария", "Мариана", "Марио", "Марияна", "Мара"],
-        (8, 20): ["Самуил"],
-        (8, 26): ["Адриан", "Адриана", "Наталия"],
-        (8, 29): ["Анастас", "Анастасия"],
-        (8, 30): ["Александър", "Александра", "Алекс", "Цанко"],
-        (9, 1): ["Симеон", "Симона"],
-        (9, 5): ["Захари", "Елисавета"],
-        (9, 16): ["Людмил", "Людмила"],
-        (9, 17): ["София", "Вяра", "Надежда", "Любов", "Любомир", "Любомира"],
-        (9, 23): ["Поликсена"],
-        (10, 1): ["Покров"],
-        (10, 5): ["Игор"],
-        (10, 14): ["Петко", "Петка", "Пенчо", "Пенка"],
-        (10, 18): ["Злата", "Златина"],
-        (10, 19): ["Йоан", "Иван"],
-        (10, 26): ["Димитър", "Димитрина", "Димо", "Димка", "Митра"],
-        (10, 27): ["Нестор"],
-        (11, 4): ["Павел"],
-        (11, 8): ["Ангел", "Ангелина", "Михаил", "Михаела", "Рангел", "Райна", "Радко"],
-        (11, 11): ["Виктор", "Виктория", "Мина"],
-        (11, 14): ["Филип", "Филипа"],
-        (11,16): ["Матей"],
-        (11, 21): ["Въведение"],
-        (11, 24): ["Екатерина", "Катя"],
-        (11, 25): ["Климент"],
-        (11, 26): ["Стилиян", "Стилияна"],
-        (11, 30): ["Андрей", "Андрея"],
-        (12, 5): ["Сава", "Савка"],
-        (12, 6): ["Никола", "Николай", "Николина", "Нина", "Ненка", "Кольо"],
-        (12, 9): ["Анна", "Анка"],
-        (12, 17): ["Данаил", "Даниел", "Даниела"],
-        (12, 20): ["Игнат", "Огнян", "Пламен"],
-        (12, 22): ["Анастасия"],
-        (12, 24): ["Евгени", "Евгения", "Жени"],
-        (12, 25): ["Христо", "Христина", "Радослав", "Радостина", "Божидар"],
-        (12, 26): ["Йосиф", "Давид"],
-        (12, 27): ["Стефан", "Стефка", "Стоян", "Стоянка", "Стамен", "Цоньо", "Цонка"]
+if np is not None:
+    # The Meeus inputs (year mod 4, 7 and 19) repeat every 532 years, so get_orthodox_easter
+    # is tabulated once as the zero-based day of a non-leap year before its 13-day shift.
+    # __wrapped__ keeps these 532 far-future years out of the memoized cache.
+    _EASTER_DAY_OF_YEAR = np.array([
+        (get_orthodox_easter.__wrapped__(year) - timedelta(days=13) - date(year, 3, 1)).days + 59
+        for year in range(2128, 2128 + 532)
+    ], dtype=np.int64)
+
+def get_movable_feasts_bulk(years):
+    """Computes the movable feasts for many years at once with NumPy array math.
+
+    Returns a dict of datetime64[D] arrays aligned with years for easter,
+    todorovden, lazarovden, pentecost and zadushnica_before_st_michael, plus
+    apostles_fast_days with the length of the Apostles' Fast in days. The
+    dates match get_movable_feast_dates and generate_year_data.
+    """
+    if np is None:
+        raise RuntimeError("get_movable_feasts_bulk requires numpy")
+    years = np.asarray(years, dtype=np.int64)
+    # Work in integer days since 1970-01-01 and convert to datetime64 once at the end.
+    previous = years - 1
+    year_start = 365 * previous + previous // 4 - previous // 100 + previous // 400 - 719162
+    leap = ((years % 4 == 0) & (years % 100 != 0)) | (years % 400 == 0)
+    # Easter always falls after February, so the leap day always shifts it.
+    easter = year_start + _EASTER_DAY_OF_YEAR[years % 532] + leap + 13
+    # Day 0 (1970-01-01) is a Thursday; shift to Python's Monday=0 weekday.
+    todorovden_offset = ((easter + 3) % 7 - 5) % 7
+    pentecost = easter + 49
+    # June 28 and November 8 are days 178 and 311 of a non-leap year.
+    june_28 = year_start + leap + 178
+    st_michael_day = year_start + leap + 311
+
+    return {
+        "easter": easter.astype("datetime64[D]"),
+        "todorovden": (easter - 48 - todorovden_offset).astype("datetime64[D]"),
+        "lazarovden": (easter - 8).astype("datetime64[D]"),
+        "pentecost": pentecost.astype("datetime64[D]"),
+        "apostles_fast_days": np.maximum(june_28 - (pentecost + 8) + 1, 0),
+        "zadushnica_before_st_michael": (st_michael_day - ((st_michael_day + 3) % 7 + 2) % 7).astype("datetime64[D]"),
     }
 
-    fixed_holidays = {
-        (1, 1): [{"name": "Нова година", "type": "secular", "description": descriptions["new_year"]}],
-        (1, 6): [{"name": "Богоявление (Йордановден)", "type": "orthodox", "description": descriptions["theophany"]}],
-        (1, 30): [{"name": "Св. Три Светители", "type": "orthodox", "description": descriptions["three_holy_hierarchs"]}],
-        (3, 3): [{"name": "Освобождение на България", "type": "secular", "description": descriptions["liberation_day"]}],
-        (3, 25): [{"name": "Благовещение", "type": "orthodox", "description": descriptions["annunciation"]}],
-        (5, 1): [{"name": "Ден на труда", "type": "secular", "description": descriptions["labor_day"]}],
-        (5, 6): [
-            {"name": "Гергьовден, Ден на храбростта", "type": "secular", "description": descriptions["st_georges_day_secular"]},
-            {"name": "Св. вмчк. Георги Победоносец", "type": "orthodox", "description": descriptions["st_george_orthodox"]}
-        ],
-        (5, 24): [
-            {"name": "Ден на славянската писменост", "type": "secular", "description": descriptions["cyril_methodius_day_secular"]},
-            {"name": "Св. св. Кирил и Методий", "type": "orthodox", "description": descriptions["sts_cyril_methodius_orthodox"]}
-        ],
-        (8, 6): [{"name": "Преображение Господне", "type": "orthodox", "description": descriptions["transfiguration"]}],
-        (8, 15): [{"name": "Успение Богородично", "type": "orthodox", "description": descriptions["dormition"]}],
-        (9, 6): [{"name": "Ден на Съединението", "type": "secular", "description": descriptions["unification_day"]}],
-        (9, 8): [{"name": "Рождество Богородично", "type": "orthodox", "description": descriptions["nativity_theotokos"]}],
-        (9, 14): [{"name": "Въздвижение на Светия Кръст (Кръстовден)", "type": "orthodox", "description": descriptions["cross_elevation"]}],
-        (9, 22): [{"name": "Ден на Независимостта", "type": "secular", "description": descriptions["independence_day"]}],
-        (10, 1): [{"name": "Покров Богородичен", "type": "orthodox", "description": descriptions["protection_theotokos"]}],
-        (10, 19): [{"name": "Св. Йоан Рилски", "type": "orthodox", "description": descriptions["st_john_of_rila"]}],
-        (11, 21): [{"name": "Въведение Богородично", "type": "orthodox", "description": descriptions["presentation_theotokos"]}],
-        (12, 6): [{"name": "Св. Николай Чудотворец (Никулден)", "type": "orthodox", "description": descriptions["st_nicholas"]}],
-        (12, 24): [{"name": "Бъдни вечер", "type": "orthodox", "description": descriptions["christmas_eve"]}],
-        (12, 25): [{"name": "Рождество Христово", "type": "orthodox"}],
-        (12, 26): [{"name": "Събор на Пресвета Богородица", "type": "orthodox"}]
+def build_year_table(year):
+    """Builds the events of a single year as a compact table of catalog ids."""
+    builder = YearBuilder(year)
+    feasts = get_movable_feast_dates(year)
+    easter_date = feasts["easter"]
+    todorovden_date = feasts["todorovden"]
+    palm_sunday = feasts["palm_sunday"]
+    lazarovden = feasts["lazarovden"]
+    pentecost_date = feasts["pentecost"]
+
+    # Add movable holidays based on Easter date
+    movable_holidays = {
+        easter_date - timedelta(days=57): [event_catalog.add("Месопустна задушница", "orthodox", descriptions["zadushnica_before_great_lent"])],
+        easter_date - timedelta(days=49): [event_catalog.add("Сирни заговезни", "orthodox", descriptions["sirni_zagovezni"])],
+        todorovden_date: [event_catalog.add("Тодоровден", "orthodox", descriptions["todorovden"])],
+        lazarovden: [event_catalog.add("Лазаровден", "orthodox", descriptions["lazarovden"])],
+        palm_sunday: [event_catalog.add("Цветница", "orthodox", descriptions["palm_sunday"])],
+        easter_date - timedelta(days=2): [event_catalog.add("Велики петък", "orthodox", descriptions["good_friday"])],
+        easter_date - timedelta(days=1): [event_catalog.add("Велика събота", "orthodox", descriptions["holy_saturday"])],
+        easter_date: [event_catalog.add("ВЕЛИКДЕН", "orthodox", descriptions["easter"])],
+        easter_date + timedelta(days=1): [event_catalog.add("Светли понеделник", "orthodox")],
+        easter_date + timedelta(days=39): [event_catalog.add("Възнесение Господне (Спасовден)", "orthodox", descriptions["ascension"])],
+        pentecost_date - timedelta(days=1): [event_catalog.add("Черешова задушница", "orthodox", descriptions["zadushnica_before_pentecost"])],
+        pentecost_date: [event_catalog.add("Петдесетница", "orthodox", descriptions["pentecost"])],
     }
 
-    non_working_days_fixed = [(1,1), (3,3), (5,1), (5,6), (5,24), (9,6), (9,22), (12,24), (12,25), (12,26)]
+    # Add name days for movable holidays
+    movable_holidays.setdefault(todorovden_date, []).append(event_catalog.add(f"Имен ден: {', '.join(movable_name_days['todorovden'])}", "name-day", descriptions["nameday_description"]))
+    movable_holidays.setdefault(lazarovden, []).append(event_catalog.add(f"Имен ден: {', '.join(movable_name_days['lazarovden'])}", "name-day", descriptions["nameday_description"]))
+    movable_holidays.setdefault(palm_sunday, []).append(event_catalog.add(f"Имен ден: {', '.join(movable_name_days['palm_sunday'])}, и всички с имена на цветя", "name-day", descriptions["nameday_description"]))
+    movable_holidays.setdefault(feasts["ascension"], []).append(event_catalog.add(f"Имен ден: {', '.join(movable_name_days['ascension'])}", "name-day", descriptions["nameday_description"]))
+
+    st_michael_day = date(year, 11, 8)
+    zadushnica_st_michael = st_michael_day - timedelta(days=(st_michael_day.weekday() + 2) % 7)
+    builder.add(zadushnica_st_michael, event_catalog.add("Архангелова задушница", "orthodox", descriptions["zadushnica_before_st_michael"]))
+
+    for (month, day), event_id in name_day_event_ids.items():
+        builder.add(date(year, month, day), event_id)
+
+    for (month, day), event_ids in fixed_holiday_event_ids.items():
+        builder.add(date(year, month, day), *event_ids)
+    for day, events in movable_holidays.items():
+        builder.add(day, *events)
+
+    non_working_easter = [easter_date - timedelta(days=2), easter_date, easter_date + timedelta(days=1)]
+    for day in non_working_easter:
+        builder.add(day, event_catalog.add("Неработен ден", "non-working", descriptions["non_working"]))
+
+    # Days already marked non-working by Easter keep a single entry, as duplicates are dropped on insert.
+    for (month, day) in non_working_days_fixed:
+        builder.add(date(year, month, day), event_catalog.add("Неработен ден", "non-working", descriptions["non_working"]))
+
+    # Add fasting periods
+    # Great Lent
+    builder.add_range(easter_date - timedelta(days=48), 48, event_catalog.add("Велик пост", "fasting", descriptions["great_lent"]))
+
+    # Apostles' Fast
+    apostles_fast_start = pentecost_date + timedelta(days=8)
+    apostles_fast_end = date(year, 6, 28)
+    if apostles_fast_start <= apostles_fast_end:
+        builder.add_range(apostles_fast_start, (apostles_fast_end - apostles_fast_start).days + 1, event_catalog.add("Петров пост", "fasting", descriptions["apostles_fast"]))
+
+    # Dormition Fast
+    builder.add_range(date(year, 8, 1), 15, event_catalog.add("Богородичен пост", "fasting", descriptions["dormition_fast"]))
+
+    # Nativity Fast
+    builder.add_range(date(year, 11, 15), 40, event_catalog.add("Рождественски пост", "fasting", descriptions["nativity_fast"]))
+
+    # Strict fasting days
+    builder.add(date(year, 12, 24), event_catalog.add("Строг пост", "fasting", descriptions["strict_fast"]))
+    builder.add(easter_date - timedelta(days=2), event_catalog.add("Строг пост", "fasting", descriptions["strict_fast"]))
+    builder.add(date(year, 8, 29), event_catalog.add("Строг пост (Отсичане главата на св. Йоан Предтеча)", "fasting", descriptions["strict_fast"]))
+    builder.add(date(year, 9, 14), event_catalog.add("Строг пост (Кръстовден)", "fasting", descriptions["strict_fast"]))
+
+    return builder.table()
+
+@lru_cache(maxsize=512)
+def get_year_table(year):
+    """Returns the compact event table of a year, from the calendar store when it has the year."""
+    if calendar_store is not None:
+        table = calendar_store.get(year)
+        if table is not None:
+            cache_counters["calendar_store_hit"] += 1
+            return table
+    cache_counters["calendar_store_miss"] += 1
+    return build_year_table(year)
+
+def generate_year_data(year):
+    """Generates the twelve months of calendar data for a single year."""
+    months = [{"month": f"{month_names_bg[i]} {year}", "days": {}} for i in range(12)]
+    day_labels = _DAY_LABELS[is_leap_year(year)]
+    for day_of_year, event_id in zip(*get_year_table(year).rows()):
+        month_index, day_key = day_labels[day_of_year]
+        months[month_index]["days"].setdefault(day_key, []).append(event_catalog.events[event_id])
+    return months
+
+def encode_year_months(year):
+    """Encodes the twelve months of a year to compact JSON straight from its event table.
+
+    The output is byte for byte what jsonify produces for generate_year_data,
+    with every event's JSON taken from the catalog instead of re-encoded.
+    """
+    month_days = [{} for _ in range(12)]
+    day_labels = _DAY_LABELS[is_leap_year(year)]
+    for day_of_year, event_id in zip(*get_year_table(year).rows()):
+        month_index, day_key = day_labels[day_of_year]
+        month_days[month_index].setdefault(day_key, []).append(event_catalog.encoded[event_id])
+
+    encoded = []
+    for month_index, days in enumerate(month_days):
+        # sort_keys orders day keys as strings ("1", "10", "11", ..., "2", ...).
+        day_parts = [b'"' + day_key.encode() + b'":[' + b",".join(days[day_key]) + b"]" for day_key in sorted(days)]
+        month_name = json.dumps(f"{month_names_bg[month_index]} {year}", ensure_ascii=True).encode()
+        encoded.append(b'{"days":{' + b",".join(day_parts) + b'},"month":' + month_name + b"}")
+    return encoded
 
+# Bump when the layout of the calendar store file changes.
+CALENDAR_STORE_VERSION = 1
+# The rule tables and the bytecode of the functions that apply them are hashed automatically;
+# bump this for a rule change neither of them shows.
+CALENDAR_RULES_VERSION = 1
+CALENDAR_STORE_MAGIC = b"PKAL"
+CALENDAR_STORE_PATH = os.environ.get("CALENDAR_STORE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "calendar.store"))
+# magic, version, rules hash, first year, year count, catalog offset, catalog length
+_STORE_HEADER = struct.Struct("<4sH32sHHII")
+# byte offset and row count of each year
+_STORE_INDEX_ENTRY = struct.Struct("<II")
+
+def iter_code_fingerprint(code):
+    """Yields the bytecode, names and constants of a code object and the code nested in it.
+
+    Unlike the source these survive bytecode-only deploys. Constants hold the
+    hard-coded rules (event names, day offsets), so changing one changes the hash.
+    """
+    yield code.co_code
+    yield repr(code.co_names).encode("utf-8")
+    for constant in code.co_consts:
+        if isinstance(constant, types.CodeType):
+            yield from iter_code_fingerprint(constant)
+        elif isinstance(constant, frozenset):
+            # Set order depends on the string hash seed, so sort for a stable hash.
+            yield repr(sorted(map(repr, constant))).encode("utf-8")
+        else:
+            yield repr(constant).encode("utf-8")
+
+def get_rules_code():
+    """Returns the functions that turn the rule tables into year tables."""
+    functions = [get_orthodox_easter.__wrapped__, get_movable_feast_dates, build_year_table, is_leap_year, EventCatalog.add]
+    functions += [function for _, function in sorted(vars(YearBuilder).items()) if isinstance(function, types.FunctionType)]
+    return functions
+
+@lru_cache(maxsize=None)
+def get_rules_hash():
+    """Hashes the rule tables, the code applying them and CALENDAR_RULES_VERSION,
+    so a store built from other rules is rejected."""
+    rules = {
+        "version": CALENDAR_RULES_VERSION,
+        "month_names_bg": month_names_bg,
+        "descriptions": descriptions,
+        "name_days": sorted(name_days.items()),
+        "movable_name_days": movable_name_days,
+        "fixed_holidays": sorted(fixed_holidays.items()),
+        "non_working_days_fixed": non_working_days_fixed,
+        "type_priority": type_priority,
+    }
+    rules_hash = hashlib.sha256(json.dumps(rules, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+    for function in get_rules_code():
+        for part in iter_code_fingerprint(function.__code__):
+            rules_hash.update(part)
+    return rules_hash.digest()
+
+def write_calendar_store(path, start_year, end_year):
+    """Serializes the year tables of a range of years into a calendar store file.
+
+    The file holds a header, a per-year (offset, count) index, the event
+    catalog as JSON and then each year's days and event ids as little-endian
+    unsigned 16-bit arrays. It is written to a temporary file and moved into
+    place so a running server never maps a partial file.
+    """
+    tables = [build_year_table(year) for year in range(start_year, end_year + 1)]
+    catalog = json.dumps(
+        [[event["name"], event["type"], event.get("description")] for event in event_catalog.events],
+        ensure_ascii=False,
+    ).encode("utf-8")
+    catalog += b"\0" * (len(catalog) % 2)
+    catalog_offset = _STORE_HEADER.size + _STORE_INDEX_ENTRY.size * len(tables)
+    offset = catalog_offset + len(catalog)
+
+    index = []
+    rows = []
+    for table in tables:
+        index.append(_STORE_INDEX_ENTRY.pack(offset, len(table.days)))
+        for column in table.rows():
+            column = array("H", column)
+            if sys.byteorder != "little":
+                column.byteswap()
+            rows.append(column.tobytes())
+        offset += 4 * len(table.days)
+
+    header = _STORE_HEADER.pack(CALENDAR_STORE_MAGIC, CALENDAR_STORE_VERSION, get_rules_hash(),
+                                start_year, len(tables), catalog_offset, len(catalog))
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as store_file:
+        store_file.write(header)
+        store_file.writelines(index)
+        store_file.write(catalog)
+        store_file.writelines(rows)
+    os.replace(temporary_path, path)
+
+class CalendarStore:
+    """Year tables served from a memory-mapped calendar store file."""
+
+    def __init__(self, path):
+        with open(path, "rb") as store_file:
+            self.mapping = mmap.mmap(store_file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self.mapping)
+        magic, version, rules_hash, self.start_year, self.year_count, catalog_offset, catalog_length = _STORE_HEADER.unpack_from(view)
+        if magic != CALENDAR_STORE_MAGIC or version != CALENDAR_STORE_VERSION:
+            raise ValueError(f"{path} is not a version {CALENDAR_STORE_VERSION} calendar store")
+        if rules_hash != get_rules_hash():
+            raise ValueError(f"{path} was built from different calendar rules")
+        index_end = _STORE_HEADER.size + _STORE_INDEX_ENTRY.size * self.year_count
+        if not (index_end <= catalog_offset and catalog_offset + catalog_length <= len(self.mapping)):
+            raise ValueError(f"{path} is truncated or corrupt")
+        for position in range(self.year_count):
+            offset, count = _STORE_INDEX_ENTRY.unpack_from(view, _STORE_HEADER.size + _STORE_INDEX_ENTRY.size * position)
+            if offset < catalog_offset + catalog_length or offset % 2 or offset + 4 * count > len(self.mapping):
+                raise ValueError(f"{path} is truncated or corrupt")
+        self.view = view
+        # Map the ids in the file onto event_catalog ids; identical catalogs need no remapping.
+        stored_events = json.loads(bytes(view[catalog_offset:catalog_offset + catalog_length]).rstrip(b"\0"))
+        self.id_map = [event_catalog.add(name, event_type, description) for name, event_type, description in stored_events]
+        self.identity = self.id_map == list(range(len(self.id_map))) and sys.byteorder == "little"
+
+    def get(self, year):
+        """Returns the table of a year, or None when the store does not cover it."""
+        position = year - self.start_year
+        if not 0 <= position < self.year_count:
+            return None
+        offset, count = _STORE_INDEX_ENTRY.unpack_from(self.view, _STORE_HEADER.size + _STORE_INDEX_ENTRY.size * position)
+        days = self.view[offset:offset + 2 * count].cast("H")
+        event_ids = self.view[offset + 2 * count:offset + 4 * count].cast("H")
+        if not self.identity:
+            days, event_ids = array("H", days), array("H", event_ids)
+            if sys.byteorder != "little":
+                days.byteswap()
+                event_ids.byteswap()
+            event_ids = array("H", (self.id_map[event_id] for event_id in event_ids))
+        return YearTable(year, days, event_ids)
+
+def open_calendar_store(path=CALENDAR_STORE_PATH):
+    """Maps the calendar store if it exists and matches the current rules, otherwise returns None."""
+    if not os.path.exists(path):
+        return None
+    try:
+        return CalendarStore(path)
+    except (ValueError, struct.error) as error:
+        app.logger.warning("Ignoring calendar store: %s", error)
+        return None
+
+calendar_store = open_calendar_store()
+
+@app.cli.command("build-store")
+def build_store_command():
+    """Precomputes every supported year into the calendar store file."""
+    write_calendar_store(CALENDAR_STORE_PATH, MIN_YEAR, MAX_YEAR)
+    print(f"Wrote {MAX_YEAR - MIN_YEAR + 1} years to {CALENDAR_STORE_PATH}")
+
+def iter_calendar_data(start_year, end_year):
+    """Yields the months of generate_calendar_data one at a time, building one year at a time."""
     for year in range(start_year, end_year + 1):
-        all_events = {}
-        easter_date = get_orthodox_easter(year)
-        
-        # Add movable holidays based on Easter date
-        todorovden_offset = (easter_date.weekday() - 5) % 7
-        todorovden_date = easter_date - timedelta(days=48 + todorovden_offset)
-
-        # Palm Sunday is the Sunday before Easter
-        palm_sunday = easter_date - timedelta(days=7)
-        # Lazarovden is the Saturday before Palm Sunday
-        lazarovden = palm_sunday - timedelta(days=1)
-        
-        pentecost_date = easter_date + timedelta(days=49)
-
-        movable_holidays = {
-            easter_date - timedelta(days=57): [{"name": "Месопустна задушница", "type": "orthodox", "description": descriptions["zadushnica_before_great_lent"]}],
-            easter_date - timedelta(days=49): [{"name": "Сирни заговезни", "type": "orthodox", "description": descriptions["sirni_zagovezni"]}],
-            todorovden_date: [{"name": "Тодоровден", "type": "orthodox", "description": descriptions["todorovden"]}],
-            lazarovden: [{"name": "Лазаровден", "type": "orthodox", "description": descriptions["lazarovden"]}],
-            palm_sunday: [{"name": "Цветница", "type": "orthodox", "description": descriptions["palm_sunday"]}],
-            easter_date - timedelta(days=2): [{"name": "Велики петък", "type": "orthodox", "description": descriptions["good_friday"]}],
-            easter_date - timedelta(days=1): [{"name": "Велика събота", "type": "orthodox", "description": descriptions["holy_saturday"]}],
-            easter_date: [{"name": "ВЕЛИКДЕН", "type": "orthodox", "description": descriptions["easter"]}],
-            easter_date + timedelta(days=1): [{"name": "Светли понеделник", "type": "orthodox"}],
-            easter_date + timedelta(days=39): [{"name": "Възнесение Господне (Спасовден)", "type": "orthodox", "description": descriptions["ascension"]}],
-            pentecost_date - timedelta(days=1): [{"name": "Черешова задушница", "type": "orthodox", "description": descriptions["zadushnica_before_pentecost"]}],
-            pentecost_date: [{"name": "Петдесетница", "type": "orthodox", "description": descriptions["pentecost"]}],
-        }
-
-        # Add name days for movable holidays
-        movable_holidays.setdefault(todorovden_date, []).append({"name": "Имен ден: Тодор, Тодорка, Теодор", "type": "name-day", "description": descriptions["nameday_description"]})
-        movable_holidays.setdefault(lazarovden, []).append({"name": "Имен ден: Лазар, Лазарка", "type": "name-day", "description": descriptions["nameday_description"]})
-        movable_holidays.setdefault(palm_sunday, []).append({"name": "Имен ден: Цветан, Цветанка, Цветомир, Цветомира, и всички с имена на цветя", "type": "name-day", "description": descriptions["nameday_description"]})
-        movable_holidays.setdefault(easter_date + timedelta(days=39), []).append({"name": "Имен ден: Спас, Спаска", "type": "name-day", "description": descriptions["nameday_description"]})
-
-        st_michael_day = date(year, 11, 8)
-        zadushnica_st_michael = st_michael_day - timedelta(days=(st_michael_day.weekday() + 2) % 7)
-        all_events.setdefault(zadushnica_st_michael, []).extend([{"name": "Архангелова задушница", "type": "orthodox", "description": descriptions["zadushnica_before_st_michael"]}])
-
-        for (month, day), names in name_days.items():
-            event = {"name": f"Имен ден: {', '.join(names)}", "type": "name-day", "description": descriptions["nameday_description"]}
-            all_events.setdefault(date(year, month, day), []).append(event)
-
-        for (month, day), events in fixed_holidays.items():
-            all_events.setdefault(date(year, month, day), []).extend(events)
-        for day, events in movable_holidays.items():
-            all_events.setdefault(day, []).extend(events)
-
-        non_working_easter = [easter_date - timedelta(days=2), easter_date, easter_date + timedelta(days=1)]
-        for day in non_working_easter:
-            all_events.setdefault(day, []).append({"name": "Неработен ден", "type": "non-working", "description": descriptions["non_working"]})
-
-        for (month, day) in non_working_days_fixed:
-            d = date(year, month, day)
-            if not any(e.get('type') == 'non-working' for e in all_events.get(d, [])):
-                all_events.setdefault(d, []).append({"name": "Неработен ден", "type": "non-working", "description": descriptions["non_working"]})
-
-        # Add fasting periods
-        # Great Lent
-        for i in range(48):
-            day = easter_date - timedelta(days=48 - i)
-            all_events.setdefault(day, []).append({"name": "Велик пост", "type": "fasting", "description": descriptions["great_lent"]})
-        
-        # Apostles' Fast
-        apostles_fast_start = pentecost_date + timedelta(days=8)
-        apostles_fast_end = date(year, 6, 28)
-        if apostles_fast_start <= apostles_fast_end:
-            current_day = apostles_fast_start
-            while current_day <= apostles_fast_end:
-                all_events.setdefault(current_day, []).append({"name": "Петров пост", "type": "fasting", "description": descriptions["apostles_fast"]})
-                current_day += timedelta(days=1)
-
-        # Dormition Fast
-        for i in range(15):
-            day = date(year, 8, 1) + timedelta(days=i)
-            all_events.setdefault(day, []).append({"name": "Богородичен пост", "type": "fasting", "description": descriptions["dormition_fast"]})
-
-        # Nativity Fast
-        for i in range(40):
-            day = date(year, 11, 15) + timedelta(days=i)
-            all_events.setdefault(day, []).append({"name": "Рождественски пост", "type": "fasting", "description": descriptions["nativity_fast"]})
-
-        # Strict fasting days
-        all_events.setdefault(date(year, 12, 24), []).append({"name": "Строг пост", "type": "fasting", "description": descriptions["strict_fast"]})
-        all_events.setdefault(easter_date - timedelta(days=2), []).append({"name": "Строг пост", "type": "fasting", "description": descriptions["strict_fast"]})
-        all_events.setdefault(date(year, 8, 29), []).append({"name": "Строг пост (Отсичане главата на св. Йоан Предтеча)", "type": "fasting", "description": descriptions["strict_fast"]})
-        all_events.setdefault(date(year, 9, 14), []).append({"name": "Строг пост (Кръстовден)", "type": "fasting", "description": descriptions["strict_fast"]})
-
-
-        monthly_data = {f"{month_names_bg[i]} {year}": {"month": f"{month_names_bg[i]} {year}", "days": {}} for i in range(12)}
-        for day, events in all_events.items():
-            if day.year == year:
-                month_key = f"{month_names_bg[day.month - 1]} {day.year}"
-                day_key = str(day.day)
-
-                unique_events = []
-                added_event_names = set()
-                type_priority = ['non-working', 'orthodox', 'secular', 'name-day', 'fasting']
-                sorted_events = sorted(events, key=lambda x: type_priority.index(x.get('type', '')) if x.get('type') in type_priority else 99)
-
-                for e in sorted_events:
-                    if e['name'] not in added_event_names:
-                        unique_events.append(e)
-                        added_event_names.add(e['name'])
-                monthly_data[month_key]["days"][day_key] = unique_events
-
-        calendar_data.extend(monthly_data.values())
-
-    return sorted(calendar_data, key=lambda x: (int(x['month'].split()[1]), month_names_bg.index(x['month'].split()[0])))
+        yield from generate_year_data(year)
+
+def generate_calendar_data(start_year, end_year):
+    """Generates the full calendar data including fixed, movable, and fasting dates."""
+    return list(iter_calendar_data(start_year, end_year))
 
 @app.route("/")
 def index():
@@ -315,12 +707,624 @@ def index():
 def calendar():
     return render_template('calendar.html')
 
+def get_year_json(year):
+    """Returns the encoded months of a single year, generating them on first use."""
+    encoded = _year_json_cache.get(year)
+    if encoded is None:
+        cache_counters["year_json_miss"] += 1
+        encoded = encode_year_months(year)
+        _year_json_cache[year] = encoded
+    else:
+        cache_counters["year_json_hit"] += 1
+    return encoded
+
+def iter_months(start, end):
+    """Yields (year, month) pairs from start to end inclusive, months numbered 1-12."""
+    year, month = start
+    while (year, month) <= end:
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+def get_response_etag(*key):
+    """Returns a strong ETag for a response that is fully determined by key and the calendar rules."""
+    return hashlib.sha256(get_rules_hash() + repr(key).encode("utf-8")).hexdigest()
+
+def build_calendar_response_body(start, end):
+    """Joins the cached encoded months between two (year, month) pairs into a JSON array."""
+    parts = [get_year_json(year)[month - 1] for year, month in iter_months(start, end)]
+    return b"[" + b",".join(parts) + b"]\n"
+
+@lru_cache(maxsize=None)
+def get_default_calendar_response_body():
+    """Returns the body of the default window, the only one kept whole in memory."""
+    return build_calendar_response_body((DEFAULT_START_YEAR, 1), (DEFAULT_END_YEAR, 12))
+
+def get_calendar_response_body(start, end):
+    """Returns the JSON body and strong ETag for the months between two (year, month) pairs."""
+    if (start, end) == ((DEFAULT_START_YEAR, 1), (DEFAULT_END_YEAR, 12)):
+        body = get_default_calendar_response_body()
+    else:
+        body = build_calendar_response_body(start, end)
+    return body, get_response_etag("calendar-data", start, end)
+
+def warm_calendar_cache():
+    """Precomputes the default calendar data so the first request does not pay for it."""
+    get_default_calendar_response_body()
+
+def cached_json_response(body, etag, max_age=CALENDAR_DATA_MAX_AGE):
+    """Builds a cacheable JSON response that answers conditional GETs with 304."""
+    response = app.response_class(body, mimetype="application/json")
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    return response.make_conditional(request)
+
+def check_year(year):
+    if not MIN_YEAR <= year <= MAX_YEAR:
+        abort(400, description=f"Year must be between {MIN_YEAR} and {MAX_YEAR}")
+    return year
+
+def parse_year(value):
+    """Parses a YYYY query value, aborting with 400 when it is malformed or out of range."""
+    # int() would also take "2_024", " 2024" and non-ASCII digits.
+    if not re.fullmatch(r"\d{4}", value, re.ASCII):
+        abort(400, description=f"Invalid year: {value!r}")
+    return check_year(int(value))
+
+def parse_year_month(value):
+    """Parses a YYYY-MM query value into a (year, month) pair."""
+    match = re.fullmatch(r"(\d{4})-(\d{2})", value, re.ASCII)
+    if match is None or not 1 <= int(match[2]) <= 12:
+        abort(400, description=f"Invalid month, expected YYYY-MM: {value!r}")
+    return check_year(int(match[1])), int(match[2])
+
+def parse_month_window(args, max_months=MAX_RANGE_MONTHS):
+    """Reads ?year= or ?from=YYYY-MM&to=YYYY-MM, falling back to the default years."""
+    if "year" in args:
+        if "from" in args or "to" in args:
+            abort(400, description="Use either year or from/to, not both")
+        year = parse_year(args["year"])
+        return (year, 1), (year, 12)
+    if "from" not in args and "to" not in args:
+        return (DEFAULT_START_YEAR, 1), (DEFAULT_END_YEAR, 12)
+
+    # A single bound selects just that month.
+    start = parse_year_month(args.get("from") or args["to"])
+    end = parse_year_month(args.get("to") or args["from"])
+    if start > end:
+        abort(400, description="from must not be after to")
+    months = (end[0] - start[0]) * 12 + end[1] - start[1] + 1
+    if months > max_months:
+        abort(400, description=f"At most {max_months} months can be requested at once")
+    return start, end
+
+def iter_encoded_months(start, end):
+    """Yields the encoded JSON of each month between two (year, month) pairs.
+
+    Years that are not already cached are encoded without being added to the
+    cache, so a wide range only ever holds one year of JSON in memory.
+    """
+    for year in range(start[0], end[0] + 1):
+        months = _year_json_cache.get(year) or encode_year_months(year)
+        first = start[1] if year == start[0] else 1
+        last = end[1] if year == end[0] else 12
+        yield from months[first - 1:last]
+
+def iter_json_array(months):
+    """Streams encoded months as one JSON array, byte for byte like the buffered response."""
+    separator = b"["
+    for month in months:
+        yield separator + month
+        separator = b","
+    yield b"[]\n" if separator == b"[" else b"]\n"
+
+def iter_ndjson(months):
+    """Streams encoded months as newline-delimited JSON, one month per line."""
+    for month in months:
+        yield month + b"\n"
+
+STREAM_FORMATS = {
+    "json": (iter_json_array, "application/json"),
+    "ndjson": (iter_ndjson, "application/x-ndjson"),
+}
+
 @app.route("/calendar-data")
 def calendar_data():
-    data = generate_calendar_data(2024, 2027)
-    return jsonify(data)
+    stream = request.args.get("stream")
+    if stream is None:
+        start, end = parse_month_window(request.args)
+        body, etag = get_calendar_response_body(start, end)
+        return cached_json_response(body, etag)
+
+    if stream not in STREAM_FORMATS:
+        abort(400, description=f"stream must be one of: {', '.join(STREAM_FORMATS)}")
+    # Streamed responses never hold the whole range, so any supported range is allowed.
+    start, end = parse_month_window(request.args, max_months=(MAX_YEAR - MIN_YEAR + 1) * 12)
+    encode, mimetype = STREAM_FORMATS[stream]
+    response = app.response_class(encode(iter_encoded_months(start, end)), mimetype=mimetype)
+    response.cache_control.public = True
+    response.cache_control.max_age = CALENDAR_DATA_MAX_AGE
+    return response
+
+def parse_date_window(args):
+    """Reads a month window like parse_month_window, allowing the full supported range,
+    and returns the first and last date it covers."""
+    (start_year, start_month), (end_year, end_month) = parse_month_window(
+        args, max_months=(MAX_YEAR - MIN_YEAR + 1) * 12)
+    start = date(start_year, start_month, 1)
+    end = date(end_year + end_month // 12, end_month % 12 + 1, 1) - timedelta(days=1)
+    return start, end
+
+def tokenize(text):
+    """Splits text into case-folded word tokens; casefold also lowers Cyrillic."""
+    return re.findall(r"\w+", text.casefold())
+
+class SearchIndex:
+    """Inverted index from word tokens to the dates on which matching events occur."""
+
+    def __init__(self, calendar_data):
+        self.events = []
+        # Ordinals of the dates each event falls on, in ascending order.
+        self.occurrences = []
+        event_ids = {}
+        postings = {}
+        for month_data in calendar_data:
+            month_name, year = month_data["month"].split()
+            month = month_names_bg.index(month_name) + 1
+            for day_key, events in month_data["days"].items():
+                ordinal = date(int(year), month, int(day_key)).toordinal()
+                for event in events:
+                    key = (event["name"], event["type"], event.get("description", ""))
+                    event_id = event_ids.get(key)
+                    if event_id is None:
+                        event_id = event_ids[key] = len(self.events)
+                        self.events.append(event)
+                        self.occurrences.append([])
+                        # Only the text is indexed; the type would make "orthodox" match every feast.
+                        for token in tokenize(f"{event['name']} {event.get('description', '')}"):
+                            postings.setdefault(token, set()).add(event_id)
+                    self.occurrences[event_id].append(ordinal)
+        for dates in self.occurrences:
+            dates.sort()
+        self.tokens = sorted(postings)
+        self.postings = [postings[token] for token in self.tokens]
+
+    def match_prefix(self, prefix):
+        """Returns the ids of events having a token that starts with prefix."""
+        matched = set()
+        position = bisect.bisect_left(self.tokens, prefix)
+        while position < len(self.tokens) and self.tokens[position].startswith(prefix):
+            matched |= self.postings[position]
+            position += 1
+        return matched
+
+    def search(self, query, start, end, offset=0, limit=SEARCH_PER_PAGE):
+        """Finds events matching every query word between two dates.
+
+        Returns the total number of occurrences and the requested page of
+        (date, event) pairs in date order.
+        """
+        words = tokenize(query)
+        if not words:
+            return 0, []
+        event_ids = set.intersection(*(self.match_prefix(word) for word in words))
+
+        start_ordinal, end_ordinal = start.toordinal(), end.toordinal()
+        streams = []
+        total = 0
+        for event_id in sorted(event_ids):
+            dates = self.occurrences[event_id]
+            low = bisect.bisect_left(dates, start_ordinal)
+            high = bisect.bisect_right(dates, end_ordinal)
+            if low < high:
+                total += high - low
+                streams.append(zip(itertools.islice(dates, low, high), itertools.repeat(event_id)))
+        if offset >= total:
+            return total, []
+        page = itertools.islice(heapq.merge(*streams), offset, offset + limit)
+        return total, [(date.fromordinal(ordinal), self.events[event_id]) for ordinal, event_id in page]
+
+@lru_cache(maxsize=None)
+def get_search_index():
+    """Builds the search index over every supported year on first use."""
+    return SearchIndex(generate_calendar_data(MIN_YEAR, MAX_YEAR))
+
+def parse_positive_int(args, name, default, maximum=None):
+    """Reads an optional positive integer query parameter, aborting with 400 when invalid."""
+    value = args.get(name)
+    if value is None:
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        abort(400, description=f"Invalid {name}: {value!r}")
+    if value < 1 or (maximum is not None and value > maximum):
+        abort(400, description=f"{name} must be a positive integer" + (f" up to {maximum}" if maximum else ""))
+    return value
+
+@app.route("/search")
+def search():
+    query = request.args.get("q", "").strip()
+    if not query:
+        abort(400, description="Missing search query q")
+    start, end = parse_date_window(request.args)
+    page = parse_positive_int(request.args, "page", 1, SEARCH_MAX_PAGE)
+    per_page = parse_positive_int(request.args, "per_page", SEARCH_PER_PAGE, SEARCH_MAX_PER_PAGE)
+
+    total, matches = get_search_index().search(query, start, end, (page - 1) * per_page, per_page)
+    return jsonify({
+        "query": query,
+        "total": total,
+        "page": page,
+        "per_page": per_page,
+        "results": [
+            {
+                "date": day.isoformat(),
+                "month": f"{month_names_bg[day.month - 1]} {day.year}",
+                "day": str(day.day),
+                "feast": event,
+            }
+            for day, event in matches
+        ],
+    })
+
+def build_name_day_index():
+    """Maps each case-folded name to the fixed (month, day) pairs and movable feasts it is celebrated on."""
+    index = {}
+    for month_day, names in name_days.items():
+        for name in names:
+            entry = index.setdefault(name.casefold(), {"name": name, "fixed": [], "movable": []})
+            entry["fixed"].append(month_day)
+    for feast, names in movable_name_days.items():
+        for name in names:
+            entry = index.setdefault(name.casefold(), {"name": name, "fixed": [], "movable": []})
+            entry["movable"].append(feast)
+    return index
+
+name_day_index = build_name_day_index()
+
+def get_name_day_dates(name, start, end):
+    """Returns the canonical spelling of name and the sorted dates between start and end
+    on which it is celebrated, or None for unknown names."""
+    entry = name_day_index.get(name.casefold())
+    if entry is None:
+        return None
+    dates = []
+    for year in range(start.year, end.year + 1):
+        dates.extend(date(year, month, day) for month, day in entry["fixed"])
+        if entry["movable"]:
+            feasts = get_movable_feast_dates(year)
+            dates.extend(feasts[feast] for feast in entry["movable"])
+    return entry["name"], sorted(day for day in set(dates) if start <= day <= end)
+
+@app.route("/name-days/<name>")
+def name_day_dates(name):
+    start, end = parse_date_window(request.args)
+    found = get_name_day_dates(name, start, end)
+    if found is None:
+        abort(404, description=f"Unknown name: {name}")
+    canonical_name, dates = found
+    return jsonify({"name": canonical_name, "dates": [day.isoformat() for day in dates]})
+
+def escape_ics_text(text):
+    """Escapes a TEXT property value as required by RFC 5545."""
+    return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+def fold_ics_line(line):
+    """Folds a content line into CRLF-terminated chunks of at most 75 octets without splitting UTF-8 characters."""
+    encoded = line.encode("utf-8")
+    chunks = []
+    limit = 75
+    while len(encoded) > limit:
+        cut = limit
+        # Back up to the start of a UTF-8 character.
+        while encoded[cut] & 0xC0 == 0x80:
+            cut -= 1
+        chunks.append(encoded[:cut])
+        encoded = encoded[cut:]
+        # Continuation lines start with a space, which counts towards the limit.
+        limit = 74
+    chunks.append(encoded)
+    return b"\r\n ".join(chunks) + b"\r\n"
+
+def render_vevent(day, event):
+    """Renders one all-day event as a VEVENT block."""
+    stamp = day.strftime("%Y%m%d")
+    uid = hashlib.sha1(f"{event['type']}|{event['name']}".encode("utf-8")).hexdigest()[:16]
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{stamp}-{uid}@pravoslaven-kalendar",
+        f"DTSTAMP:{RULES_LAST_MODIFIED.strftime('%Y%m%dT%H%M%SZ')}",
+        f"DTSTART;VALUE=DATE:{stamp}",
+        f"DTEND;VALUE=DATE:{(day + timedelta(days=1)).strftime('%Y%m%d')}",
+        f"SUMMARY:{escape_ics_text(event['name'])}",
+    ]
+    if "description" in event:
+        lines.append(f"DESCRIPTION:{escape_ics_text(event['description'])}")
+    lines += [f"CATEGORIES:{event['type']}", "TRANSP:TRANSPARENT", "END:VEVENT"]
+    return b"".join(fold_ics_line(line) for line in lines)
+
+@lru_cache(maxsize=4096)
+def get_ics_month_blocks(year, event_type):
+    """Returns the pre-rendered VEVENTs of one event type in a year, one block per month."""
+    months = [[] for _ in range(12)]
+    jan_1 = date(year, 1, 1)
+    for day_of_year, event_id in zip(*get_year_table(year).rows()):
+        event = event_catalog.events[event_id]
+        if event["type"] == event_type:
+            day = jan_1 + timedelta(days=day_of_year)
+            months[day.month - 1].append(render_vevent(day, event))
+    return tuple(b"".join(blocks) for blocks in months)
+
+ICS_HEADER = b"".join(fold_ics_line(line) for line in [
+    "BEGIN:VCALENDAR",
+    "VERSION:2.0",
+    "PRODID:-//Pravoslaven kalendar//BG",
+    "CALSCALE:GREGORIAN",
+    "X-WR-CALNAME:Православен календар",
+])
+ICS_FOOTER = fold_ics_line("END:VCALENDAR")
+
+def get_ics_body(start, end, event_types):
+    """Returns the iCalendar body and strong ETag for the given months and event types.
+
+    The body is joined from the cached month blocks on every request rather
+    than cached whole, so memory does not grow with the windows clients ask for.
+    """
+    parts = [ICS_HEADER]
+    for year, month in iter_months(start, end):
+        parts.extend(get_ics_month_blocks(year, event_type)[month - 1] for event_type in event_types)
+    parts.append(ICS_FOOTER)
+    # DTSTAMP is RULES_LAST_MODIFIED, so it is part of what the body depends on.
+    return b"".join(parts), get_response_etag("calendar.ics", start, end, event_types, RULES_LAST_MODIFIED)
+
+@app.route("/calendar.ics")
+def calendar_ics():
+    requested = {event_type for event_type in request.args.get("types", "").split(",") if event_type}
+    event_types = tuple(sorted(requested)) if requested else tuple(type_priority)
+    unknown = set(event_types) - set(type_priority)
+    if unknown:
+        abort(400, description=f"Unknown event types: {', '.join(sorted(unknown))}")
+    start, end = parse_month_window(request.args)
+    body, etag = get_ics_body(start, end, event_types)
+
+    response = app.response_class(body, mimetype="text/calendar")
+    response.set_etag(etag)
+    response.last_modified = RULES_LAST_MODIFIED
+    response.cache_control.public = True
+    response.cache_control.max_age = ICS_MAX_AGE
+    return response.make_conditional(request)
+
+class BusinessDayIndex:
+    """Working days between MIN_YEAR and MAX_YEAR as a bitmap with prefix sums.
+
+    A day is non-working on weekends and when its year table lists a
+    non-working event. prefix[i] is the number of working days before day i,
+    counted from January 1 of MIN_YEAR, so counts are O(1) and adding working
+    days is a binary search.
+    """
+
+    def __init__(self, start_year, end_year):
+        self.first = date(start_year, 1, 1)
+        self.last = date(end_year, 12, 31)
+        first_ordinal = self.first.toordinal()
+        working = bytearray(self.last.toordinal() - first_ordinal + 1)
+        for offset in range(len(working)):
+            # toordinal() % 7 is 0 on Sundays and 6 on Saturdays.
+            working[offset] = (first_ordinal + offset) % 7 not in (0, 6)
+        for year in range(start_year, end_year + 1):
+            year_offset = date(year, 1, 1).toordinal() - first_ordinal
+            for day_of_year, event_id in zip(*get_year_table(year).rows()):
+                if event_catalog.events[event_id]["type"] == "non-working":
+                    working[year_offset + day_of_year] = 0
+        self.working = working
+        self.prefix = array("l", itertools.accumulate(working, initial=0))
+
+    def _offset(self, day):
+        if not self.first <= day <= self.last:
+            raise ValueError(f"Date must be between {self.first} and {self.last}")
+        return day.toordinal() - self.first.toordinal()
+
+    def is_working_day(self, day):
+        return bool(self.working[self._offset(day)])
+
+    def count(self, start, end):
+        """Counts the working days from start to end, both inclusive."""
+        if start > end:
+            raise ValueError("start must not be after end")
+        return self.prefix[self._offset(end) + 1] - self.prefix[self._offset(start)]
+
+    def add(self, day, days):
+        """Returns the date that is days working days after day (before it when negative)."""
+        offset = self._offset(day)
+        if days > 0:
+            # The first position whose prefix reaches the target is just past the working day sought.
+            position = bisect.bisect_left(self.prefix, self.prefix[offset + 1] + days)
+        elif days < 0:
+            position = bisect.bisect_left(self.prefix, self.prefix[offset] + days + 1)
+        else:
+            return day
+        if not 0 < position < len(self.prefix):
+            raise ValueError(f"Result falls outside {self.first} to {self.last}")
+        return self.first + timedelta(days=position - 1)
+
+@lru_cache(maxsize=None)
+def get_business_day_index():
+    """Builds the working-day index over every supported year on first use."""
+    return BusinessDayIndex(MIN_YEAR, MAX_YEAR)
+
+def parse_iso_date(value, name):
+    if not isinstance(value, str):
+        raise ValueError(f"{name} must be a YYYY-MM-DD date")
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a YYYY-MM-DD date") from None
+
+def parse_integer(value, name):
+    # int() would also take JSON true/false and truncate floats such as 2.9.
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str) and re.fullmatch(r"[+-]?[0-9]+", value):
+        return int(value)
+    raise ValueError(f"{name} must be an integer")
+
+def business_days_count(query):
+    start = parse_iso_date(query.get("start"), "start")
+    end = parse_iso_date(query.get("end"), "end")
+    working_days = get_business_day_index().count(start, end)
+    return {"start": start.isoformat(), "end": end.isoformat(), "working_days": working_days}
+
+def business_days_add(query):
+    day = parse_iso_date(query.get("date"), "date")
+    days = parse_integer(query.get("days"), "days")
+    result = get_business_day_index().add(day, days)
+    return {"date": day.isoformat(), "days": days, "result": result.isoformat()}
+
+def business_days_response(handler):
+    """Answers a single query from the query string, or a batch posted as {"queries": [...]}."""
+    if request.method == "GET":
+        try:
+            return jsonify(handler(request.args))
+        except ValueError as error:
+            abort(400, description=str(error))
+
+    payload = request.get_json(silent=True)
+    queries = payload.get("queries") if isinstance(payload, dict) else None
+    if not isinstance(queries, list) or not all(isinstance(query, dict) for query in queries):
+        abort(400, description='Expected a JSON body like {"queries": [{...}, ...]}')
+    if len(queries) > BUSINESS_DAYS_MAX_BATCH:
+        abort(400, description=f"At most {BUSINESS_DAYS_MAX_BATCH} queries can be sent at once")
+    results = []
+    for query in queries:
+        try:
+            results.append(handler(query))
+        except ValueError as error:
+            results.append({"error": str(error)})
+    return jsonify({"results": results})
+
+@app.route("/business-days/count", methods=["GET", "POST"])
+def business_days_count_route():
+    return business_days_response(business_days_count)
+
+@app.route("/business-days/add", methods=["GET", "POST"])
+def business_days_add_route():
+    return business_days_response(business_days_add)
+
+# Upper bounds, in seconds, of the request duration histogram buckets.
+METRICS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+class RequestMetrics:
+    """Per-route request duration histograms, kept per process."""
+
+    def __init__(self, buckets=METRICS_BUCKETS):
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        # route -> [per-bucket counts (last one is +Inf), total count, total seconds]
+        self.routes = {}
+
+    def observe(self, route, seconds):
+        bucket = bisect.bisect_left(self.buckets, seconds)
+        with self.lock:
+            counts, count, total = self.routes.get(route) or ([0] * (len(self.buckets) + 1), 0, 0.0)
+            counts[bucket] += 1
+            self.routes[route] = (counts, count + 1, total + seconds)
+
+    def render(self):
+        """Returns the histograms in the Prometheus text exposition format."""
+        lines = [
+            "# HELP calendar_request_duration_seconds Time spent answering requests, by route.",
+            "# TYPE calendar_request_duration_seconds histogram",
+        ]
+        with self.lock:
+            # observe() updates the bucket lists in place, so copy them to keep a consistent snapshot.
+            routes = sorted((route, (list(counts), count, total)) for route, (counts, count, total) in self.routes.items())
+        for route, (counts, count, total) in routes:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'calendar_request_duration_seconds_bucket{{route="{route}",le="{le}"}} {cumulative}')
+            lines.append(f'calendar_request_duration_seconds_count{{route="{route}"}} {count}')
+            lines.append(f'calendar_request_duration_seconds_sum{{route="{route}"}} {total:.6f}')
+        return lines
+
+def render_cache_metrics():
+    """Returns cache hit/miss counters in the Prometheus text exposition format."""
+    lines = [
+        "# HELP calendar_cache_requests_total Cache lookups, by cache and result.",
+        "# TYPE calendar_cache_requests_total counter",
+    ]
+    cached_functions = {
+        "year_table": get_year_table,
+        "default_calendar_response": get_default_calendar_response_body,
+        "ics_month_blocks": get_ics_month_blocks,
+        "orthodox_easter": get_orthodox_easter,
+    }
+    counts = {}
+    for name, function in cached_functions.items():
+        info = function.cache_info()
+        counts[(name, "hit")], counts[(name, "miss")] = info.hits, info.misses
+    for key, value in list(cache_counters.items()):
+        name, _, result = key.rpartition("_")
+        counts[(name, result)] = value
+    for (name, result), value in sorted(counts.items()):
+        lines.append(f'calendar_cache_requests_total{{cache="{name}",result="{result}"}} {value}')
+    return lines
+
+def enable_metrics(flask_app):
+    """Times every request by route and exposes the results at /metrics.
+
+    Off by default; set CALENDAR_METRICS=1 to turn it on. Each worker process
+    of a pre-forking server keeps its own numbers.
+    """
+    metrics = RequestMetrics()
+
+    @flask_app.before_request
+    def start_timer():
+        g.request_started = time.perf_counter()
+
+    @flask_app.after_request
+    def record_duration(response):
+        started = g.pop("request_started", None)
+        if started is not None:
+            route = request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+            # The server closes the response once the whole body has been sent, so
+            # streamed responses are timed until their last chunk, not until the
+            # generator is created.
+            response.call_on_close(lambda: metrics.observe(route, time.perf_counter() - started))
+        return response
+
+    @flask_app.route("/metrics")
+    def metrics_endpoint():
+        body = "\n".join(metrics.render() + render_cache_metrics()) + "\n"
+        return flask_app.response_class(body, mimetype="text/plain; version=0.0.4")
+
+    return metrics
+
+if os.environ.get("CALENDAR_METRICS") == "1":
+    request_metrics = enable_metrics(app)
+
+def warm_caches():
+    """Precomputes every supported year and the indexes built from them."""
+    for year in range(MIN_YEAR, MAX_YEAR + 1):
+        get_year_table(year)
+    warm_calendar_cache()
+    get_search_index()
+    get_business_day_index()
+
+def create_app():
+    """WSGI application factory for production servers.
+
+    With a pre-forking server that loads the app before forking (see
+    gunicorn.conf.py), the caches are built once in the master process and
+    shared copy-on-write by every worker.
+    """
+    warm_caches()
+    return app
 
 def main():
+    warm_caches()
     app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 8080)))
 
 if __name__ == "__main__":
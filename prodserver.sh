@@ -0,0 +1,3 @@
+#!/bin/sh
+source .venv/bin/activate
+exec gunicorn --config gunicorn.conf.py
\ No newline at end of file
@@ -0,0 +1,61 @@
+from datetime import date, timedelta
+
+import pytest
+
+import main
+
+@pytest.fixture(scope="module")
+def index():
+    return main.BusinessDayIndex(2024, 2026)
+
+def walk(index, day, days):
+    """Adds working days one calendar day at a time, the slow way."""
+    step = timedelta(days=1 if days > 0 else -1)
+    remaining = abs(days)
+    while remaining:
+        day += step
+        remaining -= index.is_working_day(day)
+    return day
+
+def test_count_matches_day_by_day_walk(index):
+    start = date(2024, 1, 1)
+    working = 0
+    for offset in range(3 * 365):
+        end = start + timedelta(days=offset)
+        working += index.is_working_day(end)
+        assert index.count(start, end) == working
+
+@pytest.mark.parametrize("days", [1, 3, 10, 60, -1, -3, -10, -60])
+def test_add_matches_day_by_day_walk(index, days):
+    day = date(2024, 4, 1)
+    while day < date(2026, 9, 1):
+        assert index.add(day, days) == walk(index, day, days)
+        day += timedelta(days=1)
+
+def test_add_zero_days_returns_the_same_day(index):
+    assert index.add(date(2024, 5, 4), 0) == date(2024, 5, 4)
+
+def test_add_outside_the_index_is_rejected(index):
+    with pytest.raises(ValueError):
+        index.add(date(2026, 12, 30), 10)
+
+@pytest.mark.parametrize("days", ["5", "-5", "+5", 5])
+def test_days_accepts_integers(days):
+    result = main.business_days_add({"date": "2024-05-03", "days": days})
+    assert result["days"] == int(days)
+
+@pytest.mark.parametrize("days", [True, False, 2.9, 2.0, "2.9", "abc", "", " 5", None])
+def test_days_rejects_non_integers(days):
+    with pytest.raises(ValueError, match="days must be an integer"):
+        main.business_days_add({"date": "2024-05-03", "days": days})
+
+def test_batch_reports_invalid_days_per_query():
+    client = main.app.test_client()
+    response = client.post("/business-days/add", json={"queries": [
+        {"date": "2024-05-03", "days": True},
+        {"date": "2024-05-03", "days": 1},
+    ]})
+    assert response.status_code == 200
+    first, second = response.get_json()["results"]
+    assert first == {"error": "days must be an integer"}
+    assert second["result"] == "2024-05-07"
@@ -0,0 +1,26 @@
+import pytest
+
+import main
+
+@pytest.fixture(scope="module")
+def client():
+    return main.app.test_client()
+
+@pytest.mark.parametrize("query", [
+    "from=2024-%C2%B2&to=2024-12",
+    "from=2024-1&to=2024-12",
+    "from=2024-13&to=2024-12",
+    "from=%C2%B2024-01&to=2024-12",
+    "year=2_024",
+    "year=%202024",
+    "year=%D9%A2%D9%A0%D9%A2%D9%A4",
+    "year=1899",
+])
+def test_malformed_windows_are_rejected(client, query):
+    assert client.get(f"/calendar-data?{query}").status_code == 400
+
+def test_month_window(client):
+    response = client.get("/calendar-data?from=2024-11&to=2025-02")
+    assert response.status_code == 200
+    assert [month["month"] for month in response.get_json()] == [
+        "Ноември 2024", "Декември 2024", "Януари 2025", "Февруари 2025"]
@@ -0,0 +1,32 @@
+import types
+
+import pytest
+
+import main
+
+@pytest.fixture
+def store_path(tmp_path):
+    path = tmp_path / "calendar.store"
+    main.write_calendar_store(path, 2024, 2026)
+    yield path
+    main.get_rules_hash.cache_clear()
+
+def test_store_round_trip(store_path):
+    store = main.open_calendar_store(store_path)
+    for year in range(2024, 2027):
+        assert list(zip(*store.get(year).rows())) == list(zip(*main.build_year_table(year).rows()))
+    assert store.get(2027) is None
+
+def test_truncated_store_is_ignored(store_path):
+    data = store_path.read_bytes()
+    store_path.write_bytes(data[:-2000])
+    assert main.open_calendar_store(store_path) is None
+
+def test_hard_coded_rule_change_invalidates_store(store_path, monkeypatch):
+    code = main.build_year_table.__code__
+    constants = tuple("Тодоровден (нов)" if constant == "Тодоровден" else constant for constant in code.co_consts)
+    assert constants != code.co_consts
+    renamed = types.FunctionType(code.replace(co_consts=constants), main.build_year_table.__globals__)
+    monkeypatch.setattr(main, "build_year_table", renamed)
+    main.get_rules_hash.cache_clear()
+    assert main.open_calendar_store(store_path) is None
@@ -0,0 +1,30 @@
+import hashlib
+import os
+import sys
+
+import pytest
+
+import main
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from year_assembly import GOLDEN_SHA256, golden_digest
+
+@pytest.fixture
+def cold_engine(monkeypatch):
+    """Builds every year from the rules: no calendar store and empty caches."""
+    monkeypatch.setattr(main, "calendar_store", None)
+    monkeypatch.setattr(main, "_year_json_cache", {})
+    main.get_year_table.cache_clear()
+    main.get_orthodox_easter.cache_clear()
+    yield
+    main.get_year_table.cache_clear()
+
+def test_encoded_years_match_golden(cold_engine):
+    assert golden_digest() == GOLDEN_SHA256
+
+def test_calendar_data_route_matches_golden(cold_engine):
+    client = main.app.test_client()
+    response = client.get(f"/calendar-data?stream=json&from={main.MIN_YEAR}-01&to={main.MAX_YEAR}-12")
+    assert response.status_code == 200
+    assert hashlib.sha256(response.data).hexdigest() == GOLDEN_SHA256
@@ -0,0 +1,23 @@
+from datetime import datetime, timezone
+
+import pytest
+
+import main
+
+@pytest.fixture(scope="module")
+def client():
+    return main.app.test_client()
+
+def test_etag_changes_with_dtstamp(client, monkeypatch):
+    first = client.get("/calendar.ics?year=2025")
+    monkeypatch.setattr(main, "RULES_LAST_MODIFIED", datetime(2000, 1, 1, tzinfo=timezone.utc))
+    main.get_ics_month_blocks.cache_clear()
+    second = client.get("/calendar.ics?year=2025")
+    main.get_ics_month_blocks.cache_clear()
+    assert b"DTSTAMP:20000101T000000Z" in second.data
+    assert first.data != second.data
+    assert first.headers["ETag"] != second.headers["ETag"]
+
+def test_empty_types_are_ignored(client):
+    assert client.get("/calendar.ics?year=2025&types=orthodox,").status_code == 200
+    assert client.get("/calendar.ics?year=2025&types=orthodox,unknown").status_code == 400
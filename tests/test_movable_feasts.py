@@ -0,0 +1,36 @@
+from datetime import date, timedelta
+
+import pytest
+
+import main
+
+np = pytest.importorskip("numpy")
+
+YEARS = range(1700, 2400)
+
+@pytest.fixture(scope="module")
+def bulk():
+    return main.get_movable_feasts_bulk(list(YEARS))
+
+def as_date(value):
+    return value.astype(object)
+
+@pytest.mark.parametrize("name", ["easter", "todorovden", "lazarovden", "pentecost"])
+def test_bulk_matches_scalar_feasts(bulk, name):
+    assert [as_date(day) for day in bulk[name]] == [main.get_movable_feast_dates(year)[name] for year in YEARS]
+
+def test_bulk_zadushnica_before_st_michael(bulk):
+    for year, day in zip(YEARS, bulk["zadushnica_before_st_michael"]):
+        st_michael_day = date(year, 11, 8)
+        assert as_date(day) == st_michael_day - timedelta(days=(st_michael_day.weekday() + 2) % 7)
+
+def test_bulk_apostles_fast_length(bulk):
+    for year, length in zip(YEARS, bulk["apostles_fast_days"]):
+        start = main.get_movable_feast_dates(year)["pentecost"] + timedelta(days=8)
+        assert length == max((date(year, 6, 28) - start).days + 1, 0)
+
+def test_bulk_apostles_fast_matches_year_tables(bulk):
+    apostles_fast = main.event_catalog.add("Петров пост", "fasting", main.descriptions["apostles_fast"])
+    for index in range(0, len(YEARS), 7):
+        _, event_ids = main.build_year_table(YEARS[index]).rows()
+        assert list(event_ids).count(apostles_fast) == bulk["apostles_fast_days"][index]
@@ -0,0 +1,21 @@
+import pytest
+
+import main
+
+@pytest.fixture(scope="module")
+def client():
+    return main.app.test_client()
+
+def test_event_types_are_not_indexed(client):
+    response = client.get("/search?q=orthodox&from=2024-01&to=2024-12")
+    assert response.status_code == 200
+    assert response.get_json()["total"] == 0
+
+@pytest.mark.parametrize("query", ["page=abc", "page=0", "page=99999999999999999999", f"page={main.SEARCH_MAX_PAGE + 1}", "per_page=1.5", f"per_page={main.SEARCH_MAX_PER_PAGE + 1}"])
+def test_invalid_paging_is_rejected(client, query):
+    assert client.get(f"/search?q=Никулден&{query}").status_code == 400
+
+def test_page_past_the_last_result_is_empty(client):
+    response = client.get(f"/search?q=Никулден&page={main.SEARCH_MAX_PAGE}&per_page={main.SEARCH_MAX_PER_PAGE}")
+    assert response.status_code == 200
+    assert response.get_json()["results"] == []